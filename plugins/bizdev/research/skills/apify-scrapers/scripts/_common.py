@@ -0,0 +1,104 @@
+"""
+Setup and output helpers shared by the Apify scraper scripts.
+
+Callers load their .env (load_dotenv) before using these helpers.
+"""
+
+import os
+from datetime import datetime
+from functools import lru_cache
+from pathlib import Path
+
+from apify_client import ApifyClient
+
+from _json_io import write_json
+
+OUTPUT_DIR = Path(__file__).parent.parent / ".tmp"
+_OUTPUT_DIR_READY = False
+
+
+def validate_env(token_name: str = "APIFY_TOKEN") -> str:
+    """
+    Validate that a required environment variable is set.
+
+    Args:
+        token_name: Name of the environment variable
+
+    Returns:
+        str: The variable's value
+    """
+    token = os.getenv(token_name)
+    if not token:
+        raise ValueError(
+            f"{token_name} not found in environment. "
+            "Please add it to your .env file."
+        )
+    return token
+
+
+@lru_cache(maxsize=1)
+def get_client() -> ApifyClient:
+    """Get the shared Apify client instance, reusing its connection pool."""
+    return ApifyClient(os.getenv("APIFY_TOKEN"))
+
+
+def ensure_output_dir() -> Path:
+    """Create the output directory once per process and return it."""
+    global _OUTPUT_DIR_READY
+    if not _OUTPUT_DIR_READY:
+        OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
+        _OUTPUT_DIR_READY = True
+    return OUTPUT_DIR
+
+
+def build_output_path(prefix: str, filename: str = None, output_dir: Path = None,
+                      now: datetime = None) -> Path:
+    """
+    Build the path of a results file, creating its directory if needed.
+
+    Args:
+        prefix: Start of the default filename, e.g. "linkedin_posts"
+        filename: Custom filename (optional)
+        output_dir: Directory to write to (defaults to .tmp)
+        now: Scrape session time used in the default filename (optional)
+
+    Returns:
+        Path: Output file path
+    """
+    if output_dir is None:
+        output_dir = ensure_output_dir()
+    else:
+        output_dir = Path(output_dir)
+        output_dir.mkdir(parents=True, exist_ok=True)
+
+    if not filename:
+        timestamp = (now or datetime.now()).strftime("%Y%m%d_%H%M%S")
+        filename = f"{prefix}_{timestamp}.json"
+
+    return output_dir / filename
+
+
+def save_json_results(data: dict, platform: str, filename: str = None,
+                      output_dir: Path = None, now: datetime = None,
+                      stream_key: str = None) -> Path:
+    """
+    Save results as JSON and report where they were written.
+
+    Args:
+        data: Top-level JSON object to save
+        platform: Start of the default filename, e.g. "reddit_ai_tech"
+        filename: Custom filename (optional)
+        output_dir: Directory to write to (defaults to .tmp)
+        now: Scrape session time used in the default filename (optional)
+        stream_key: Key of the list in data to stream item by item (optional)
+
+    Returns:
+        Path: Output file path
+    """
+    output_path = build_output_path(platform, filename, output_dir, now)
+
+    write_json(output_path, data, stream_key=stream_key)
+
+    print(f"\n💾 Results saved to: {output_path}")
+
+    return output_path
@@ -0,0 +1,105 @@
+"""
+JSON output helpers shared by the Apify scraper scripts.
+
+Uses orjson when it is installed and falls back to the standard library.
+"""
+
+import json
+from pathlib import Path
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+WRITE_BUFFER_SIZE = 1 << 20
+RAW_CHUNK_SIZE = 64 * 1024
+
+
+def _encode(value) -> bytes:
+    """Encode a value as 2-space indented UTF-8 JSON."""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(value, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+    return json.dumps(value, indent=2, ensure_ascii=False).encode("utf-8")
+
+
+def dumps(value) -> str:
+    """Encode a value as 2-space indented JSON text."""
+    return _encode(value).decode("utf-8")
+
+
+def _nest(encoded: bytes, depth: int) -> bytes:
+    """Re-indent an encoded value so it sits depth levels deep."""
+    # Raw newlines only appear between tokens; newlines inside strings are escaped
+    return encoded.replace(b"\n", b"\n" + b"  " * depth)
+
+
+def write_json(path: Path, data: dict, stream_key: str = None) -> None:
+    """
+    Write data to path as 2-space indented JSON.
+
+    When stream_key names a list in data, its elements are encoded and written
+    one at a time, so only a single element's bytes are held in memory. The
+    output is identical to encoding the whole dict at once.
+
+    Args:
+        path: Output file path
+        data: Top-level JSON object
+        stream_key: Key of the list to stream element by element (optional)
+    """
+    if stream_key is None or not data.get(stream_key):
+        with open(path, "wb") as f:
+            f.write(_encode(data))
+        return
+
+    with open(path, "wb", buffering=WRITE_BUFFER_SIZE) as f:
+        f.write(b"{")
+        for index, (key, value) in enumerate(data.items()):
+            if index:
+                f.write(b",")
+            f.write(b"\n  " + _encode(key) + b": ")
+
+            if key != stream_key:
+                f.write(_nest(_encode(value), 1))
+                continue
+
+            _write_array(f, value, 1)
+        f.write(b"\n}")
+
+
+def _write_array(f, items, depth: int) -> None:
+    """Encode items one at a time as a JSON array sitting depth levels deep."""
+    indent = b"\n" + b"  " * (depth + 1)
+    f.write(b"[")
+    empty = True
+    for element in items:
+        if not empty:
+            f.write(b",")
+        f.write(indent + _nest(_encode(element), depth + 1))
+        empty = False
+    f.write(b"]" if empty else b"\n" + b"  " * depth + b"]")
+
+
+def write_dataset_raw(dataset, path: Path) -> None:
+    """
+    Copy an Apify dataset's items to path as a JSON array without decoding them.
+
+    Uses DatasetClient.stream_items when the installed apify-client returns a
+    response with iter_bytes; otherwise falls back to re-encoding the items
+    from iterate_items one at a time.
+
+    Args:
+        dataset: Apify DatasetClient for the dataset to copy
+        path: Output file path
+    """
+    if hasattr(dataset, "stream_items"):
+        with dataset.stream_items(item_format="json") as response:
+            if hasattr(response, "iter_bytes"):
+                with open(path, "wb") as f:
+                    for chunk in response.iter_bytes(RAW_CHUNK_SIZE):
+                        f.write(chunk)
+                return
+
+    with open(path, "wb", buffering=WRITE_BUFFER_SIZE) as f:
+        _write_array(f, dataset.iterate_items(), 0)
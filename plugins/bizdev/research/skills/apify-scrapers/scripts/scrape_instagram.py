@@ -20,22 +20,19 @@ Usage:
     python scrape_instagram.py comments https://www.instagram.com/p/ABC123/ --max-comments 100 --output comments.json
 """
 
-import os
-import json
 import re
+import sys
 from datetime import datetime
 from pathlib import Path
-from apify_client import ApifyClient
 from dotenv import load_dotenv
 import argparse
+from operator import itemgetter
+
+from _common import get_client, save_json_results, validate_env
 
 # Load environment variables
 load_dotenv()
 
-# Configuration
-APIFY_TOKEN = os.getenv("APIFY_TOKEN")
-OUTPUT_DIR = Path(__file__).parent.parent / ".tmp"
-
 # Apify Actor IDs for different Instagram scraping modes
 ACTORS = {
     "profile": "apify/instagram-profile-scraper",
@@ -46,15 +43,6 @@ ACTORS = {
 }
 
 
-def validate_environment():
-    """Validate required environment variables."""
-    if not APIFY_TOKEN:
-        raise ValueError(
-            "APIFY_TOKEN not found in environment. "
-            "Please add it to your .env file."
-        )
-
-
 def validate_instagram_url(url: str) -> bool:
     """
     Validate Instagram post/reel URL format.
@@ -79,7 +67,7 @@ def normalize_username(username: str) -> str:
     Returns:
         str: Normalized username
     """
-    return username.lstrip('@')
+    return username.removeprefix('@')
 
 
 def build_profile_url(username: str) -> str:
@@ -87,32 +75,24 @@ def build_profile_url(username: str) -> str:
     return f"https://www.instagram.com/{normalize_username(username)}/"
 
 
-def run_profile_scraper(usernames: list) -> dict:
+def _run_actor(mode: str, run_input: dict, query: list) -> dict:
     """
-    Scrape Instagram profile data.
+    Run the Apify actor for a scraping mode and collect its dataset.
 
     Args:
-        usernames: List of Instagram usernames
+        mode: Scraping mode (key into ACTORS)
+        run_input: Actor input payload
+        query: Original query echoed back in the results
 
     Returns:
-        dict: Scraper results with profile data
+        dict: Scraper results with dataset items
     """
-    print(f"Starting Instagram profile scraper")
-    print(f"Profiles: {usernames}")
-
-    client = ApifyClient(APIFY_TOKEN)
+    client = get_client()
 
-    # Build profile URLs
-    profile_urls = [build_profile_url(u) for u in usernames]
-
-    run_input = {
-        "usernames": [normalize_username(u) for u in usernames]
-    }
-
-    print(f"Running Actor: {ACTORS['profile']}")
+    print(f"Running Actor: {ACTORS[mode]}")
 
     try:
-        run = client.actor(ACTORS['profile']).call(run_input=run_input)
+        run = client.actor(ACTORS[mode]).call(run_input=run_input)
 
         print(f"Actor run completed!")
         print(f"Run ID: {run['id']}")
@@ -125,8 +105,8 @@ def run_profile_scraper(usernames: list) -> dict:
             "dataset_id": run["defaultDatasetId"],
             "items": dataset_items,
             "count": len(dataset_items),
-            "mode": "profile",
-            "query": usernames
+            "mode": mode,
+            "query": query
         }
 
     except Exception as e:
@@ -136,11 +116,31 @@ def run_profile_scraper(usernames: list) -> dict:
             "error": str(e),
             "items": [],
             "count": 0,
-            "mode": "profile",
-            "query": usernames
+            "mode": mode,
+            "query": query
         }
 
 
+def run_profile_scraper(usernames: list) -> dict:
+    """
+    Scrape Instagram profile data.
+
+    Args:
+        usernames: List of Instagram usernames
+
+    Returns:
+        dict: Scraper results with profile data
+    """
+    print(f"Starting Instagram profile scraper")
+    print(f"Profiles: {usernames}")
+
+    run_input = {
+        "usernames": [normalize_username(u) for u in usernames]
+    }
+
+    return _run_actor("profile", run_input, usernames)
+
+
 def run_posts_scraper(usernames: list, max_posts: int = 50) -> dict:
     """
     Scrape Instagram posts from profiles.
@@ -156,8 +156,6 @@ def run_posts_scraper(usernames: list, max_posts: int = 50) -> dict:
     print(f"Profiles: {usernames}")
     print(f"Max posts per profile: {max_posts}")
 
-    client = ApifyClient(APIFY_TOKEN)
-
     # Build profile URLs for direct URLs input
     direct_urls = [build_profile_url(u) for u in usernames]
 
@@ -169,36 +167,7 @@ def run_posts_scraper(usernames: list, max_posts: int = 50) -> dict:
         "searchLimit": 1
     }
 
-    print(f"Running Actor: {ACTORS['posts']}")
-
-    try:
-        run = client.actor(ACTORS['posts']).call(run_input=run_input)
-
-        print(f"Actor run completed!")
-        print(f"Run ID: {run['id']}")
-
-        dataset_items = list(client.dataset(run["defaultDatasetId"]).iterate_items())
-
-        return {
-            "success": True,
-            "run_id": run['id'],
-            "dataset_id": run["defaultDatasetId"],
-            "items": dataset_items,
-            "count": len(dataset_items),
-            "mode": "posts",
-            "query": usernames
-        }
-
-    except Exception as e:
-        print(f"Actor run failed: {str(e)}")
-        return {
-            "success": False,
-            "error": str(e),
-            "items": [],
-            "count": 0,
-            "mode": "posts",
-            "query": usernames
-        }
+    return _run_actor("posts", run_input, usernames)
 
 
 def run_hashtag_scraper(hashtags: list, max_posts: int = 100) -> dict:
@@ -216,8 +185,6 @@ def run_hashtag_scraper(hashtags: list, max_posts: int = 100) -> dict:
     print(f"Hashtags: {hashtags}")
     print(f"Max posts per hashtag: {max_posts}")
 
-    client = ApifyClient(APIFY_TOKEN)
-
     # Clean hashtags (remove # if present)
     clean_hashtags = [h.lstrip('#') for h in hashtags]
 
@@ -227,36 +194,7 @@ def run_hashtag_scraper(hashtags: list, max_posts: int = 100) -> dict:
         "resultsType": "posts"
     }
 
-    print(f"Running Actor: {ACTORS['hashtag']}")
-
-    try:
-        run = client.actor(ACTORS['hashtag']).call(run_input=run_input)
-
-        print(f"Actor run completed!")
-        print(f"Run ID: {run['id']}")
-
-        dataset_items = list(client.dataset(run["defaultDatasetId"]).iterate_items())
-
-        return {
-            "success": True,
-            "run_id": run['id'],
-            "dataset_id": run["defaultDatasetId"],
-            "items": dataset_items,
-            "count": len(dataset_items),
-            "mode": "hashtag",
-            "query": clean_hashtags
-        }
-
-    except Exception as e:
-        print(f"Actor run failed: {str(e)}")
-        return {
-            "success": False,
-            "error": str(e),
-            "items": [],
-            "count": 0,
-            "mode": "hashtag",
-            "query": clean_hashtags
-        }
+    return _run_actor("hashtag", run_input, clean_hashtags)
 
 
 def run_reels_scraper(usernames: list, max_reels: int = 20) -> dict:
@@ -274,46 +212,12 @@ def run_reels_scraper(usernames: list, max_reels: int = 20) -> dict:
     print(f"Profiles: {usernames}")
     print(f"Max reels per profile: {max_reels}")
 
-    client = ApifyClient(APIFY_TOKEN)
-
-    # Build profile URLs
-    profile_urls = [build_profile_url(u) for u in usernames]
-
     run_input = {
         "usernames": [normalize_username(u) for u in usernames],
         "resultsLimit": max_reels
     }
 
-    print(f"Running Actor: {ACTORS['reels']}")
-
-    try:
-        run = client.actor(ACTORS['reels']).call(run_input=run_input)
-
-        print(f"Actor run completed!")
-        print(f"Run ID: {run['id']}")
-
-        dataset_items = list(client.dataset(run["defaultDatasetId"]).iterate_items())
-
-        return {
-            "success": True,
-            "run_id": run['id'],
-            "dataset_id": run["defaultDatasetId"],
-            "items": dataset_items,
-            "count": len(dataset_items),
-            "mode": "reels",
-            "query": usernames
-        }
-
-    except Exception as e:
-        print(f"Actor run failed: {str(e)}")
-        return {
-            "success": False,
-            "error": str(e),
-            "items": [],
-            "count": 0,
-            "mode": "reels",
-            "query": usernames
-        }
+    return _run_actor("reels", run_input, usernames)
 
 
 def run_comments_scraper(post_urls: list, max_comments: int = 100) -> dict:
@@ -331,8 +235,6 @@ def run_comments_scraper(post_urls: list, max_comments: int = 100) -> dict:
     print(f"Posts: {post_urls}")
     print(f"Max comments per post: {max_comments}")
 
-    client = ApifyClient(APIFY_TOKEN)
-
     # Validate URLs
     for url in post_urls:
         if not validate_instagram_url(url):
@@ -343,61 +245,33 @@ def run_comments_scraper(post_urls: list, max_comments: int = 100) -> dict:
         "resultsLimit": max_comments
     }
 
-    print(f"Running Actor: {ACTORS['comments']}")
-
-    try:
-        run = client.actor(ACTORS['comments']).call(run_input=run_input)
-
-        print(f"Actor run completed!")
-        print(f"Run ID: {run['id']}")
-
-        dataset_items = list(client.dataset(run["defaultDatasetId"]).iterate_items())
+    return _run_actor("comments", run_input, post_urls)
 
-        return {
-            "success": True,
-            "run_id": run['id'],
-            "dataset_id": run["defaultDatasetId"],
-            "items": dataset_items,
-            "count": len(dataset_items),
-            "mode": "comments",
-            "query": post_urls
-        }
 
-    except Exception as e:
-        print(f"Actor run failed: {str(e)}")
-        return {
-            "success": False,
-            "error": str(e),
-            "items": [],
-            "count": 0,
-            "mode": "comments",
-            "query": post_urls
-        }
+def _build_profile(item: dict) -> dict:
+    """Build a normalized profile record from a raw Apify item."""
+    return {
+        "username": item.get("username", ""),
+        "full_name": item.get("fullName", ""),
+        "biography": item.get("biography", ""),
+        "external_url": item.get("externalUrl", ""),
+        "followers_count": item.get("followersCount", 0),
+        "following_count": item.get("followsCount", 0),
+        "posts_count": item.get("postsCount", 0),
+        "is_verified": item.get("verified", False),
+        "is_private": item.get("private", False),
+        "is_business": item.get("isBusinessAccount", False),
+        "business_category": item.get("businessCategoryName", ""),
+        "profile_pic_url": item.get("profilePicUrl", ""),
+        "profile_pic_url_hd": item.get("profilePicUrlHD", ""),
+        "profile_url": f"https://www.instagram.com/{item.get('username', '')}/",
+        "id": item.get("id", "")
+    }
 
 
 def process_profile_results(results: dict) -> dict:
     """Process profile scraper results."""
-    processed_profiles = []
-
-    for item in results["items"]:
-        profile = {
-            "username": item.get("username", ""),
-            "full_name": item.get("fullName", ""),
-            "biography": item.get("biography", ""),
-            "external_url": item.get("externalUrl", ""),
-            "followers_count": item.get("followersCount", 0),
-            "following_count": item.get("followsCount", 0),
-            "posts_count": item.get("postsCount", 0),
-            "is_verified": item.get("verified", False),
-            "is_private": item.get("private", False),
-            "is_business": item.get("isBusinessAccount", False),
-            "business_category": item.get("businessCategoryName", ""),
-            "profile_pic_url": item.get("profilePicUrl", ""),
-            "profile_pic_url_hd": item.get("profilePicUrlHD", ""),
-            "profile_url": f"https://www.instagram.com/{item.get('username', '')}/",
-            "id": item.get("id", "")
-        }
-        processed_profiles.append(profile)
+    processed_profiles = [_build_profile(item) for item in results["items"]]
 
     return {
         "scraped_at": datetime.now().isoformat(),
@@ -410,39 +284,40 @@ def process_profile_results(results: dict) -> dict:
     }
 
 
+def _build_post(item: dict) -> dict:
+    """Build a normalized post record from a raw Apify item."""
+    # Handle different response structures
+    owner = item.get("ownerUsername") or item.get("owner", {}).get("username", "")
+
+    return {
+        "id": item.get("id", ""),
+        "shortcode": item.get("shortCode", "") or item.get("shortcode", ""),
+        "caption": item.get("caption", ""),
+        "owner_username": owner,
+        "timestamp": item.get("timestamp", ""),
+        "likes_count": item.get("likesCount", 0) or item.get("likes", 0),
+        "comments_count": item.get("commentsCount", 0) or item.get("comments", 0),
+        "video_view_count": item.get("videoViewCount", 0),
+        "video_play_count": item.get("videoPlayCount", 0),
+        "is_video": item.get("isVideo", False) or item.get("type") == "Video",
+        "type": item.get("type", "Image"),
+        "display_url": item.get("displayUrl", "") or item.get("url", ""),
+        "video_url": item.get("videoUrl", ""),
+        "post_url": item.get("url", "") or f"https://www.instagram.com/p/{item.get('shortCode', '')}/",
+        "location": item.get("locationName", ""),
+        "hashtags": item.get("hashtags", []),
+        "mentions": item.get("mentions", []),
+        "engagement_score": (item.get("likesCount", 0) or item.get("likes", 0)) +
+                           (item.get("commentsCount", 0) or item.get("comments", 0)) * 2
+    }
+
+
 def process_posts_results(results: dict) -> dict:
     """Process posts scraper results."""
-    processed_posts = []
-
-    for item in results["items"]:
-        # Handle different response structures
-        owner = item.get("ownerUsername") or item.get("owner", {}).get("username", "")
-
-        post = {
-            "id": item.get("id", ""),
-            "shortcode": item.get("shortCode", "") or item.get("shortcode", ""),
-            "caption": item.get("caption", ""),
-            "owner_username": owner,
-            "timestamp": item.get("timestamp", ""),
-            "likes_count": item.get("likesCount", 0) or item.get("likes", 0),
-            "comments_count": item.get("commentsCount", 0) or item.get("comments", 0),
-            "video_view_count": item.get("videoViewCount", 0),
-            "video_play_count": item.get("videoPlayCount", 0),
-            "is_video": item.get("isVideo", False) or item.get("type") == "Video",
-            "type": item.get("type", "Image"),
-            "display_url": item.get("displayUrl", "") or item.get("url", ""),
-            "video_url": item.get("videoUrl", ""),
-            "post_url": item.get("url", "") or f"https://www.instagram.com/p/{item.get('shortCode', '')}/",
-            "location": item.get("locationName", ""),
-            "hashtags": item.get("hashtags", []),
-            "mentions": item.get("mentions", []),
-            "engagement_score": (item.get("likesCount", 0) or item.get("likes", 0)) +
-                               (item.get("commentsCount", 0) or item.get("comments", 0)) * 2
-        }
-        processed_posts.append(post)
+    processed_posts = [_build_post(item) for item in results["items"]]
 
     # Sort by engagement
-    processed_posts.sort(key=lambda x: x["engagement_score"], reverse=True)
+    processed_posts.sort(key=itemgetter("engagement_score"), reverse=True)
 
     return {
         "scraped_at": datetime.now().isoformat(),
@@ -455,36 +330,37 @@ def process_posts_results(results: dict) -> dict:
     }
 
 
+def _build_hashtag_post(item: dict) -> dict:
+    """Build a normalized hashtag post record from a raw Apify item."""
+    owner = item.get("ownerUsername") or item.get("owner", {}).get("username", "")
+
+    return {
+        "id": item.get("id", ""),
+        "shortcode": item.get("shortCode", "") or item.get("shortcode", ""),
+        "caption": item.get("caption", ""),
+        "owner_username": owner,
+        "timestamp": item.get("timestamp", ""),
+        "likes_count": item.get("likesCount", 0) or item.get("likes", 0),
+        "comments_count": item.get("commentsCount", 0) or item.get("comments", 0),
+        "video_view_count": item.get("videoViewCount", 0),
+        "is_video": item.get("isVideo", False) or item.get("type") == "Video",
+        "type": item.get("type", "Image"),
+        "display_url": item.get("displayUrl", "") or item.get("url", ""),
+        "video_url": item.get("videoUrl", ""),
+        "post_url": item.get("url", "") or f"https://www.instagram.com/p/{item.get('shortCode', '')}/",
+        "hashtags": item.get("hashtags", []),
+        "source_hashtag": item.get("hashtag", ""),
+        "engagement_score": (item.get("likesCount", 0) or item.get("likes", 0)) +
+                           (item.get("commentsCount", 0) or item.get("comments", 0)) * 2
+    }
+
+
 def process_hashtag_results(results: dict) -> dict:
     """Process hashtag scraper results."""
-    processed_posts = []
-
-    for item in results["items"]:
-        owner = item.get("ownerUsername") or item.get("owner", {}).get("username", "")
-
-        post = {
-            "id": item.get("id", ""),
-            "shortcode": item.get("shortCode", "") or item.get("shortcode", ""),
-            "caption": item.get("caption", ""),
-            "owner_username": owner,
-            "timestamp": item.get("timestamp", ""),
-            "likes_count": item.get("likesCount", 0) or item.get("likes", 0),
-            "comments_count": item.get("commentsCount", 0) or item.get("comments", 0),
-            "video_view_count": item.get("videoViewCount", 0),
-            "is_video": item.get("isVideo", False) or item.get("type") == "Video",
-            "type": item.get("type", "Image"),
-            "display_url": item.get("displayUrl", "") or item.get("url", ""),
-            "video_url": item.get("videoUrl", ""),
-            "post_url": item.get("url", "") or f"https://www.instagram.com/p/{item.get('shortCode', '')}/",
-            "hashtags": item.get("hashtags", []),
-            "source_hashtag": item.get("hashtag", ""),
-            "engagement_score": (item.get("likesCount", 0) or item.get("likes", 0)) +
-                               (item.get("commentsCount", 0) or item.get("comments", 0)) * 2
-        }
-        processed_posts.append(post)
+    processed_posts = [_build_hashtag_post(item) for item in results["items"]]
 
     # Sort by engagement
-    processed_posts.sort(key=lambda x: x["engagement_score"], reverse=True)
+    processed_posts.sort(key=itemgetter("engagement_score"), reverse=True)
 
     return {
         "scraped_at": datetime.now().isoformat(),
@@ -497,38 +373,39 @@ def process_hashtag_results(results: dict) -> dict:
     }
 
 
+def _build_reel(item: dict) -> dict:
+    """Build a normalized reel record from a raw Apify item."""
+    owner = item.get("ownerUsername") or item.get("owner", {}).get("username", "")
+
+    return {
+        "id": item.get("id", ""),
+        "shortcode": item.get("shortCode", "") or item.get("shortcode", ""),
+        "caption": item.get("caption", ""),
+        "owner_username": owner,
+        "timestamp": item.get("timestamp", ""),
+        "likes_count": item.get("likesCount", 0) or item.get("likes", 0),
+        "comments_count": item.get("commentsCount", 0) or item.get("comments", 0),
+        "play_count": item.get("videoPlayCount", 0) or item.get("playCount", 0),
+        "view_count": item.get("videoViewCount", 0) or item.get("viewCount", 0),
+        "duration": item.get("videoDuration", 0) or item.get("duration", 0),
+        "video_url": item.get("videoUrl", ""),
+        "thumbnail_url": item.get("displayUrl", "") or item.get("thumbnailUrl", ""),
+        "reel_url": item.get("url", "") or f"https://www.instagram.com/reel/{item.get('shortCode', '')}/",
+        "audio_title": item.get("musicInfo", {}).get("song_name", "") if item.get("musicInfo") else "",
+        "audio_artist": item.get("musicInfo", {}).get("artist_name", "") if item.get("musicInfo") else "",
+        "hashtags": item.get("hashtags", []),
+        "engagement_score": (item.get("likesCount", 0) or item.get("likes", 0)) +
+                           (item.get("commentsCount", 0) or item.get("comments", 0)) * 2 +
+                           (item.get("videoPlayCount", 0) or item.get("playCount", 0)) // 100
+    }
+
+
 def process_reels_results(results: dict) -> dict:
     """Process reels scraper results."""
-    processed_reels = []
-
-    for item in results["items"]:
-        owner = item.get("ownerUsername") or item.get("owner", {}).get("username", "")
-
-        reel = {
-            "id": item.get("id", ""),
-            "shortcode": item.get("shortCode", "") or item.get("shortcode", ""),
-            "caption": item.get("caption", ""),
-            "owner_username": owner,
-            "timestamp": item.get("timestamp", ""),
-            "likes_count": item.get("likesCount", 0) or item.get("likes", 0),
-            "comments_count": item.get("commentsCount", 0) or item.get("comments", 0),
-            "play_count": item.get("videoPlayCount", 0) or item.get("playCount", 0),
-            "view_count": item.get("videoViewCount", 0) or item.get("viewCount", 0),
-            "duration": item.get("videoDuration", 0) or item.get("duration", 0),
-            "video_url": item.get("videoUrl", ""),
-            "thumbnail_url": item.get("displayUrl", "") or item.get("thumbnailUrl", ""),
-            "reel_url": item.get("url", "") or f"https://www.instagram.com/reel/{item.get('shortCode', '')}/",
-            "audio_title": item.get("musicInfo", {}).get("song_name", "") if item.get("musicInfo") else "",
-            "audio_artist": item.get("musicInfo", {}).get("artist_name", "") if item.get("musicInfo") else "",
-            "hashtags": item.get("hashtags", []),
-            "engagement_score": (item.get("likesCount", 0) or item.get("likes", 0)) +
-                               (item.get("commentsCount", 0) or item.get("comments", 0)) * 2 +
-                               (item.get("videoPlayCount", 0) or item.get("playCount", 0)) // 100
-        }
-        processed_reels.append(reel)
+    processed_reels = [_build_reel(item) for item in results["items"]]
 
     # Sort by engagement
-    processed_reels.sort(key=lambda x: x["engagement_score"], reverse=True)
+    processed_reels.sort(key=itemgetter("engagement_score"), reverse=True)
 
     return {
         "scraped_at": datetime.now().isoformat(),
@@ -541,28 +418,29 @@ def process_reels_results(results: dict) -> dict:
     }
 
 
+def _build_comment(item: dict) -> dict:
+    """Build a normalized comment record from a raw Apify item."""
+    return {
+        "id": item.get("id", ""),
+        "text": item.get("text", ""),
+        "owner_username": item.get("ownerUsername", "") or item.get("owner", {}).get("username", ""),
+        "owner_profile_pic": item.get("ownerProfilePicUrl", ""),
+        "timestamp": item.get("timestamp", ""),
+        "likes_count": item.get("likesCount", 0) or item.get("likes", 0),
+        "replies_count": item.get("repliesCount", 0),
+        "post_shortcode": item.get("postShortCode", "") or item.get("shortcode", ""),
+        "post_url": item.get("postUrl", ""),
+        "is_reply": item.get("isReply", False),
+        "parent_comment_id": item.get("parentCommentId", "")
+    }
+
+
 def process_comments_results(results: dict) -> dict:
     """Process comments scraper results."""
-    processed_comments = []
-
-    for item in results["items"]:
-        comment = {
-            "id": item.get("id", ""),
-            "text": item.get("text", ""),
-            "owner_username": item.get("ownerUsername", "") or item.get("owner", {}).get("username", ""),
-            "owner_profile_pic": item.get("ownerProfilePicUrl", ""),
-            "timestamp": item.get("timestamp", ""),
-            "likes_count": item.get("likesCount", 0) or item.get("likes", 0),
-            "replies_count": item.get("repliesCount", 0),
-            "post_shortcode": item.get("postShortCode", "") or item.get("shortcode", ""),
-            "post_url": item.get("postUrl", ""),
-            "is_reply": item.get("isReply", False),
-            "parent_comment_id": item.get("parentCommentId", "")
-        }
-        processed_comments.append(comment)
+    processed_comments = [_build_comment(item) for item in results["items"]]
 
     # Sort by likes
-    processed_comments.sort(key=lambda x: x["likes_count"], reverse=True)
+    processed_comments.sort(key=itemgetter("likes_count"), reverse=True)
 
     return {
         "scraped_at": datetime.now().isoformat(),
@@ -611,6 +489,14 @@ def process_results(results: dict) -> dict:
         }
 
 
+def _preview(text: str, limit: int = 80, empty: str = "(no caption)") -> str:
+    """Flatten text to a single line, truncated to limit characters."""
+    if not text:
+        return empty
+    flat = text.replace('\n', ' ')
+    return flat if len(flat) <= limit else flat[:limit] + "..."
+
+
 def save_results(data: dict, filename: str = None) -> Path:
     """
     Save results to .tmp directory.
@@ -622,67 +508,58 @@ def save_results(data: dict, filename: str = None) -> Path:
     Returns:
         Path: Output file path
     """
-    OUTPUT_DIR.mkdir(exist_ok=True)
-
-    if not filename:
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        mode = data.get("mode", "instagram")
-        filename = f"instagram_{mode}_{timestamp}.json"
-
-    output_path = OUTPUT_DIR / filename
-
-    with open(output_path, 'w', encoding='utf-8') as f:
-        json.dump(data, f, indent=2, ensure_ascii=False)
+    output_path = save_json_results(
+        data, f"instagram_{data.get('mode', 'instagram')}", filename, stream_key="data"
+    )
 
-    print(f"\nResults saved to: {output_path}")
     print(f"Total items: {data['total_count']}")
 
-    # Print preview based on mode
+    # Build preview based on mode and emit it in a single write
     mode = data.get("mode", "")
     items = data.get("data", [])
+    lines = []
 
     if mode == "profile" and items:
-        print("\nProfile Summary:")
+        lines.append("\nProfile Summary:")
         for profile in items[:5]:
-            print(f"\n  @{profile['username']} ({profile['full_name']})")
-            print(f"  Followers: {profile['followers_count']:,} | Following: {profile['following_count']:,}")
-            print(f"  Posts: {profile['posts_count']:,} | Verified: {profile['is_verified']}")
+            lines.append(f"\n  @{profile['username']} ({profile['full_name']})")
+            lines.append(f"  Followers: {profile['followers_count']:,} | Following: {profile['following_count']:,}")
+            lines.append(f"  Posts: {profile['posts_count']:,} | Verified: {profile['is_verified']}")
 
     elif mode == "posts" and items:
-        print("\nTop Posts by Engagement:")
+        lines.append("\nTop Posts by Engagement:")
         for i, post in enumerate(items[:5], 1):
-            caption_preview = (post['caption'][:80] + "...") if post['caption'] and len(post['caption']) > 80 else (post['caption'] or "(no caption)")
-            caption_preview = caption_preview.replace('\n', ' ')
-            print(f"\n  {i}. @{post['owner_username']}")
-            print(f"     {caption_preview}")
-            print(f"     Likes: {post['likes_count']:,} | Comments: {post['comments_count']:,}")
+            caption_preview = _preview(post['caption'])
+            lines.append(f"\n  {i}. @{post['owner_username']}")
+            lines.append(f"     {caption_preview}")
+            lines.append(f"     Likes: {post['likes_count']:,} | Comments: {post['comments_count']:,}")
 
     elif mode == "hashtag" and items:
-        print("\nTop Hashtag Posts:")
+        lines.append("\nTop Hashtag Posts:")
         for i, post in enumerate(items[:5], 1):
-            caption_preview = (post['caption'][:80] + "...") if post['caption'] and len(post['caption']) > 80 else (post['caption'] or "(no caption)")
-            caption_preview = caption_preview.replace('\n', ' ')
-            print(f"\n  {i}. #{post.get('source_hashtag', '')} - @{post['owner_username']}")
-            print(f"     {caption_preview}")
-            print(f"     Likes: {post['likes_count']:,} | Comments: {post['comments_count']:,}")
+            caption_preview = _preview(post['caption'])
+            lines.append(f"\n  {i}. #{post.get('source_hashtag', '')} - @{post['owner_username']}")
+            lines.append(f"     {caption_preview}")
+            lines.append(f"     Likes: {post['likes_count']:,} | Comments: {post['comments_count']:,}")
 
     elif mode == "reels" and items:
-        print("\nTop Reels by Engagement:")
+        lines.append("\nTop Reels by Engagement:")
         for i, reel in enumerate(items[:5], 1):
-            caption_preview = (reel['caption'][:80] + "...") if reel['caption'] and len(reel['caption']) > 80 else (reel['caption'] or "(no caption)")
-            caption_preview = caption_preview.replace('\n', ' ')
-            print(f"\n  {i}. @{reel['owner_username']}")
-            print(f"     {caption_preview}")
-            print(f"     Plays: {reel['play_count']:,} | Likes: {reel['likes_count']:,}")
+            caption_preview = _preview(reel['caption'])
+            lines.append(f"\n  {i}. @{reel['owner_username']}")
+            lines.append(f"     {caption_preview}")
+            lines.append(f"     Plays: {reel['play_count']:,} | Likes: {reel['likes_count']:,}")
 
     elif mode == "comments" and items:
-        print("\nTop Comments by Likes:")
+        lines.append("\nTop Comments by Likes:")
         for i, comment in enumerate(items[:5], 1):
-            text_preview = (comment['text'][:80] + "...") if len(comment['text']) > 80 else comment['text']
-            text_preview = text_preview.replace('\n', ' ')
-            print(f"\n  {i}. @{comment['owner_username']}")
-            print(f"     {text_preview}")
-            print(f"     Likes: {comment['likes_count']:,}")
+            text_preview = _preview(comment['text'], empty="")
+            lines.append(f"\n  {i}. @{comment['owner_username']}")
+            lines.append(f"     {text_preview}")
+            lines.append(f"     Likes: {comment['likes_count']:,}")
+
+    if lines:
+        sys.stdout.write("\n".join(lines) + "\n")
 
     return output_path
 
@@ -724,6 +601,10 @@ Examples:
         "--output",
         help="Custom output filename"
     )
+    profile_parser.set_defaults(
+        func=run_profile_scraper,
+        kwarg_map={"usernames": "usernames"}
+    )
 
     # Posts mode
     posts_parser = subparsers.add_parser("posts", help="Scrape posts from profiles")
@@ -742,6 +623,10 @@ Examples:
         "--output",
         help="Custom output filename"
     )
+    posts_parser.set_defaults(
+        func=run_posts_scraper,
+        kwarg_map={"usernames": "usernames", "max_posts": "max_posts"}
+    )
 
     # Hashtag mode
     hashtag_parser = subparsers.add_parser("hashtag", help="Scrape posts by hashtag")
@@ -760,6 +645,10 @@ Examples:
         "--output",
         help="Custom output filename"
     )
+    hashtag_parser.set_defaults(
+        func=run_hashtag_scraper,
+        kwarg_map={"hashtags": "hashtags", "max_posts": "max_posts"}
+    )
 
     # Reels mode
     reels_parser = subparsers.add_parser("reels", help="Scrape reels from profiles")
@@ -778,6 +667,10 @@ Examples:
         "--output",
         help="Custom output filename"
     )
+    reels_parser.set_defaults(
+        func=run_reels_scraper,
+        kwarg_map={"usernames": "usernames", "max_reels": "max_reels"}
+    )
 
     # Comments mode
     comments_parser = subparsers.add_parser("comments", help="Scrape comments from posts")
@@ -796,6 +689,10 @@ Examples:
         "--output",
         help="Custom output filename"
     )
+    comments_parser.set_defaults(
+        func=run_comments_scraper,
+        kwarg_map={"post_urls": "post_urls", "max_comments": "max_comments"}
+    )
 
     args = parser.parse_args()
 
@@ -805,22 +702,11 @@ Examples:
 
     try:
         # Validate environment
-        validate_environment()
-
-        # Run appropriate scraper based on mode
-        if args.mode == "profile":
-            results = run_profile_scraper(args.usernames)
-        elif args.mode == "posts":
-            results = run_posts_scraper(args.usernames, args.max_posts)
-        elif args.mode == "hashtag":
-            results = run_hashtag_scraper(args.hashtags, args.max_posts)
-        elif args.mode == "reels":
-            results = run_reels_scraper(args.usernames, args.max_reels)
-        elif args.mode == "comments":
-            results = run_comments_scraper(args.post_urls, args.max_comments)
-        else:
-            print(f"Unknown mode: {args.mode}")
-            return 1
+        validate_env()
+
+        # Run the scraper bound to the selected subcommand
+        kwargs = {param: getattr(args, attr) for param, attr in args.kwarg_map.items()}
+        results = args.func(**kwargs)
 
         if not results["success"]:
             print(f"Scraping failed: {results.get('error')}")
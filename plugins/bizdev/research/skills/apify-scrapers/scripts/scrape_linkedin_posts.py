@@ -20,31 +20,26 @@ Usage:
     python execution/scrape_linkedin_posts.py author "https://www.linkedin.com/in/example-user/" --scrape-comments --scrape-reactions
 """
 
-import os
-import json
+import sys
 import re
 from datetime import datetime
 from pathlib import Path
-from apify_client import ApifyClient
 from dotenv import load_dotenv
 import argparse
+from operator import itemgetter
+
+from _common import get_client, save_json_results, validate_env
+from _json_io import dumps
 
 # Load environment variables
 load_dotenv()
 
 # Configuration
-APIFY_TOKEN = os.getenv("APIFY_TOKEN")
 ACTOR_ID = "harvestapi/linkedin-post-search"
-OUTPUT_DIR = Path(__file__).parent.parent / ".tmp"
-
+LINKEDIN_PROFILE_RE = re.compile(r'^https?://(www\.)?linkedin\.com/in/[\w-]+/?\Z')
 
-def validate_environment():
-    """Validate required environment variables."""
-    if not APIFY_TOKEN:
-        raise ValueError(
-            "APIFY_TOKEN not found in environment. "
-            "Please add it to your .env file."
-        )
+# Flattens whitespace control characters in previews to single spaces
+PREVIEW_TRANSLATION = str.maketrans({"\n": " ", "\r": " ", "\t": " "})
 
 
 def validate_linkedin_url(url: str) -> bool:
@@ -57,8 +52,7 @@ def validate_linkedin_url(url: str) -> bool:
     Returns:
         bool: True if valid LinkedIn profile URL
     """
-    pattern = r'^https?://(www\.)?linkedin\.com/in/[\w-]+/?$'
-    return bool(re.match(pattern, url))
+    return LINKEDIN_PROFILE_RE.match(url) is not None
 
 
 def run_linkedin_scraper(
@@ -67,7 +61,8 @@ def run_linkedin_scraper(
     max_posts: int = 30,
     scrape_comments: bool = False,
     scrape_reactions: bool = False,
-    max_reactions: int = 5
+    max_reactions: int = 5,
+    verbose: bool = False
 ) -> dict:
     """
     Run the LinkedIn scraper Actor.
@@ -79,6 +74,7 @@ def run_linkedin_scraper(
         scrape_comments: Whether to scrape post comments
         scrape_reactions: Whether to scrape reaction details
         max_reactions: Max reactions to scrape per post
+        verbose: Whether to print the full Actor input
 
     Returns:
         dict: Scraper results with post data
@@ -88,7 +84,7 @@ def run_linkedin_scraper(
     print(f"📝 Input: {inputs}")
 
     # Initialize Apify client
-    client = ApifyClient(APIFY_TOKEN)
+    client = get_client()
 
     # Build Actor input based on mode
     run_input = {
@@ -109,7 +105,10 @@ def run_linkedin_scraper(
     else:
         raise ValueError(f"Invalid mode: {mode}. Use 'author' or 'search'")
 
-    print(f"⏳ Running Actor with input: {json.dumps(run_input, indent=2)}")
+    if verbose:
+        print(f"⏳ Running Actor with input: {dumps(run_input)}")
+    else:
+        print("⏳ Running Actor...")
 
     try:
         run = client.actor(ACTOR_ID).call(run_input=run_input)
@@ -118,16 +117,14 @@ def run_linkedin_scraper(
         print(f"📋 Run ID: {run['id']}")
         print(f"⏱️  Duration: {run.get('stats', {}).get('runTimeSecs', 'N/A')}s")
 
-        # Fetch results from dataset
-        print("📥 Fetching results...")
-        dataset_items = list(client.dataset(run["defaultDatasetId"]).iterate_items())
+        # Lazy dataset iterator; items are fetched as process_results consumes them
+        dataset_items = client.dataset(run["defaultDatasetId"]).iterate_items()
 
         return {
             "success": True,
             "run_id": run['id'],
             "dataset_id": run["defaultDatasetId"],
             "items": dataset_items,
-            "count": len(dataset_items),
             "mode": mode,
             "query": inputs
         }
@@ -138,76 +135,106 @@ def run_linkedin_scraper(
             "success": False,
             "error": str(e),
             "items": [],
-            "count": 0,
             "mode": mode,
             "query": inputs
         }
 
 
-def process_results(results: dict) -> dict:
+def _dig(data, *keys, default=""):
     """
-    Process and structure the scraped results.
+    Look up a nested key path, returning default if any step is missing.
 
     Args:
-        results: Raw results from Apify
+        data: Dict to start from
+        *keys: Keys to follow in order
+        default: Value returned when the path is missing or null
 
     Returns:
-        dict: Cleaned and structured data
+        The value at the end of the path, or default
     """
-    processed_posts = []
-
-    for item in results["items"]:
-        # Extract engagement metrics from nested 'engagement' object
-        engagement = item.get("engagement", {})
-        likes = engagement.get("likes", 0)
-        comments_count = engagement.get("comments", 0)
-        shares = engagement.get("shares", 0)
-
-        # Extract author info from nested 'author' object
-        author = item.get("author", {})
-
-        # Extract posted time from nested 'postedAt' object
-        posted_at = item.get("postedAt", {})
-
-        # Extract image URLs from 'postImages' array
-        post_images = item.get("postImages", [])
-        media_urls = [img.get("url") for img in post_images if img.get("url")]
-
-        post = {
-            "id": item.get("id", ""),
-            "text": item.get("content", ""),
-            "author_name": author.get("name", ""),
-            "author_url": author.get("linkedinUrl", ""),
-            "author_headline": author.get("info", ""),
-            "author_avatar": author.get("avatar", {}).get("url", ""),
-            "posted_at": posted_at.get("date", ""),
-            "posted_ago": posted_at.get("postedAgoText", ""),
-            "likes": likes,
-            "comments": comments_count,
-            "reposts": shares,
-            "post_url": item.get("linkedinUrl", ""),
-            "media_urls": media_urls,
-            "hashtags": item.get("hashtags", []),
-            "engagement_score": likes + (comments_count * 2) + (shares * 3),
-            "reactions_breakdown": engagement.get("reactions", [])
-        }
+    for key in keys:
+        data = data.get(key) if isinstance(data, dict) else None
+        if data is None:
+            return default
+    return data
+
+
+def _normalize_linkedin_post(item: dict) -> dict:
+    """
+    Map a raw Apify LinkedIn item onto the output post schema.
 
-        # Include comments if scraped
-        if item.get("comments"):
-            post["comment_data"] = item["comments"]
+    Args:
+        item: Raw dataset item
+
+    Returns:
+        dict: Normalized post
+    """
+    # Extract engagement metrics from nested 'engagement' object
+    engagement = item.get("engagement", {})
+    likes = engagement.get("likes", 0)
+    comments_count = engagement.get("comments", 0)
+    shares = engagement.get("shares", 0)
+
+    # Extract author info from nested 'author' object
+    author = item.get("author", {})
+
+    # Extract posted time from nested 'postedAt' object
+    posted_at = item.get("postedAt", {})
+
+    # Extract image URLs from 'postImages' array
+    post_images = item.get("postImages", [])
+    media_urls = [url for img in post_images if (url := img.get("url"))]
+
+    post = {
+        "id": item.get("id", ""),
+        "text": item.get("content", ""),
+        "author_name": author.get("name", ""),
+        "author_url": author.get("linkedinUrl", ""),
+        "author_headline": author.get("info", ""),
+        "author_avatar": _dig(author, "avatar", "url"),
+        "posted_at": posted_at.get("date", ""),
+        "posted_ago": posted_at.get("postedAgoText", ""),
+        "likes": likes,
+        "comments": comments_count,
+        "reposts": shares,
+        "post_url": item.get("linkedinUrl", ""),
+        "media_urls": media_urls,
+        "hashtags": item.get("hashtags", []),
+        "engagement_score": likes + (comments_count * 2) + (shares * 3),
+        "reactions_breakdown": engagement.get("reactions", [])
+    }
 
-        # Include reactions if scraped
-        if item.get("reactions"):
-            post["reaction_data"] = item["reactions"]
+    # Include comments if scraped
+    if item.get("comments"):
+        post["comment_data"] = item["comments"]
 
-        processed_posts.append(post)
+    # Include reactions if scraped
+    if item.get("reactions"):
+        post["reaction_data"] = item["reactions"]
+
+    return post
+
+
+def process_results(results: dict, now: datetime = None) -> dict:
+    """
+    Process and structure the scraped results.
+
+    Args:
+        results: Raw results from Apify; "items" may be a lazy iterator
+        now: Scrape session time (defaults to the current time)
+
+    Returns:
+        dict: Cleaned and structured data
+    """
+    print("📥 Fetching results...")
+    processed_posts = [_normalize_linkedin_post(item) for item in results["items"]]
 
     # Sort by engagement score descending
-    processed_posts.sort(key=lambda x: x["engagement_score"], reverse=True)
+    processed_posts.sort(key=itemgetter("engagement_score"), reverse=True)
 
     return {
         "posts": processed_posts,
-        "scraped_at": datetime.now().isoformat(),
+        "scraped_at": (now or datetime.now()).isoformat(),
         "total_count": len(processed_posts),
         "mode": results.get("mode", "unknown"),
         "query": results.get("query", []),
@@ -215,42 +242,39 @@ def process_results(results: dict) -> dict:
     }
 
 
-def save_results(data: dict, filename: str = None) -> Path:
+def save_results(data: dict, filename: str = None, now: datetime = None) -> Path:
     """
     Save results to .tmp directory.
 
     Args:
         data: Processed post data
         filename: Custom filename (optional)
+        now: Scrape session time used in the default filename (optional)
 
     Returns:
         Path: Output file path
     """
-    OUTPUT_DIR.mkdir(exist_ok=True)
-
-    if not filename:
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        filename = f"linkedin_posts_{timestamp}.json"
-
-    output_path = OUTPUT_DIR / filename
-
-    with open(output_path, 'w', encoding='utf-8') as f:
-        json.dump(data, f, indent=2, ensure_ascii=False)
+    output_path = save_json_results(
+        data, "linkedin_posts", filename, now=now, stream_key="posts"
+    )
 
-    print(f"\n💾 Results saved to: {output_path}")
     print(f"📊 Total posts: {data['total_count']}")
 
-    # Print top posts
+    # Build top posts and emit them in a single write
+    lines = []
     if data['posts']:
-        print("\n🔥 Top Posts by Engagement:")
+        lines.append("\n🔥 Top Posts by Engagement:")
         for i, post in enumerate(data['posts'][:5], 1):
-            text_preview = post['text'][:100] + "..." if len(post['text']) > 100 else post['text']
-            text_preview = text_preview.replace('\n', ' ')
-            print(f"\n{i}. {post['author_name']}")
-            print(f"   {text_preview}")
-            print(f"   👍 {post['likes']} | 💬 {post['comments']} | 🔄 {post['reposts']}")
+            text = post['text']
+            text_preview = (text[:100] + "..." if len(text) > 100 else text).translate(PREVIEW_TRANSLATION)
+            lines.append(f"\n{i}. {post['author_name']}")
+            lines.append(f"   {text_preview}")
+            lines.append(f"   👍 {post['likes']} | 💬 {post['comments']} | 🔄 {post['reposts']}")
             if post['post_url']:
-                print(f"   🔗 {post['post_url']}")
+                lines.append(f"   🔗 {post['post_url']}")
+
+    if lines:
+        sys.stdout.write("\n".join(lines) + "\n")
 
     return output_path
 
@@ -309,12 +333,20 @@ Examples:
         "--output",
         help="Custom output filename"
     )
+    parser.add_argument(
+        "--verbose",
+        action="store_true",
+        help="Print the full Actor input"
+    )
 
     args = parser.parse_args()
 
+    # One timestamp for the whole scrape session
+    now = datetime.now()
+
     try:
         # Validate environment
-        validate_environment()
+        validate_env()
 
         # Run scraper
         results = run_linkedin_scraper(
@@ -323,22 +355,23 @@ Examples:
             max_posts=args.max_posts,
             scrape_comments=args.scrape_comments,
             scrape_reactions=args.scrape_reactions,
-            max_reactions=args.max_reactions
+            max_reactions=args.max_reactions,
+            verbose=args.verbose
         )
 
         if not results["success"]:
             print(f"❌ Scraping failed: {results.get('error')}")
             return 1
 
-        if results["count"] == 0:
+        # Process results
+        processed_data = process_results(results, now=now)
+
+        if processed_data["total_count"] == 0:
             print("⚠️  No posts found for the given input")
             return 0
 
-        # Process results
-        processed_data = process_results(results)
-
         # Save results
-        save_results(processed_data, args.output)
+        save_results(processed_data, args.output, now=now)
 
         print("\n✅ LinkedIn scraping completed successfully!")
         return 0
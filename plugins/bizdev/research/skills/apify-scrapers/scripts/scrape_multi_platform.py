@@ -7,23 +7,21 @@ Usage:
     python execution/scrape_multi_platform.py tiktok --hashtags AI ChatGPT --max-results 20
     python execution/scrape_multi_platform.py youtube --search "AI tutorial" --max-results 30
     python execution/scrape_multi_platform.py website --urls https://docs.example.com --max-pages 50
+    python execution/scrape_multi_platform.py all --hashtags AI --search "AI tutorial" --urls https://docs.example.com
 """
 
-import os
-import json
+import sys
+import asyncio
 from datetime import datetime
-from pathlib import Path
-from apify_client import ApifyClient
 from dotenv import load_dotenv
 import argparse
 
+from _common import build_output_path, get_client, save_json_results, validate_env
+from _json_io import write_dataset_raw
+
 # Load environment variables
 load_dotenv()
 
-# Configuration
-APIFY_TOKEN = os.getenv("APIFY_TOKEN")
-OUTPUT_DIR = Path(__file__).parent.parent / ".tmp"
-
 # Actor IDs
 ACTORS = {
     "tiktok": "clockworks/tiktok-scraper",
@@ -31,27 +29,16 @@ ACTORS = {
     "website": "apify/website-content-crawler"
 }
 
-def validate_environment():
-    """Validate required environment variables."""
-    if not APIFY_TOKEN:
-        raise ValueError(
-            "APIFY_TOKEN not found in environment. "
-            "Please add it to your .env file."
-        )
+TIKTOK_TAG_URL = "https://www.tiktok.com/tag/{}"
+DEFAULT_TIKTOK_HASHTAGS = ("ai", "chatgpt", "machinelearning")
 
-def scrape_tiktok(hashtags=None, max_results=50, download_videos=False):
-    """Scrape TikTok content."""
-    client = ApifyClient(APIFY_TOKEN)
+def scrape_tiktok(hashtags=None, max_results=50, download_videos=False, raw=False, now=None):
+    """Scrape TikTok content; now is the scrape session time used for scraped_at."""
+    client = get_client()
 
     # Build start URLs from hashtags
-    if hashtags:
-        start_urls = [f"https://www.tiktok.com/tag/{tag.replace('#', '')}" for tag in hashtags]
-    else:
-        start_urls = [
-            "https://www.tiktok.com/tag/ai",
-            "https://www.tiktok.com/tag/chatgpt",
-            "https://www.tiktok.com/tag/machinelearning"
-        ]
+    tags = [tag.lstrip('#') for tag in hashtags] if hashtags else DEFAULT_TIKTOK_HASHTAGS
+    start_urls = [TIKTOK_TAG_URL.format(tag) for tag in tags]
 
     run_input = {
         "startUrls": start_urls,
@@ -61,17 +48,20 @@ def scrape_tiktok(hashtags=None, max_results=50, download_videos=False):
         "shouldDownloadSubtitles": True
     }
 
-    print(f"🎵 Starting TikTok scraper for hashtags: {', '.join([url.split('/')[-1] for url in start_urls])}")
+    print(f"🎵 Starting TikTok scraper for hashtags: {', '.join(tags)}")
     print(f"📊 Max results: {max_results}")
 
     run = client.actor(ACTORS["tiktok"]).call(run_input=run_input)
+    if raw:
+        return {"dataset_id": run["defaultDatasetId"]}
+
     dataset_items = list(client.dataset(run["defaultDatasetId"]).iterate_items())
 
-    return {"videos": dataset_items, "scraped_at": datetime.now().isoformat()}
+    return {"videos": dataset_items, "scraped_at": (now or datetime.now()).isoformat()}
 
-def scrape_youtube(search_query=None, max_results=50, download_subtitles=True):
-    """Scrape YouTube content."""
-    client = ApifyClient(APIFY_TOKEN)
+def scrape_youtube(search_query=None, max_results=50, download_subtitles=True, raw=False, now=None):
+    """Scrape YouTube content; now is the scrape session time used for scraped_at."""
+    client = get_client()
 
     run_input = {
         "maxResults": max_results,
@@ -89,13 +79,16 @@ def scrape_youtube(search_query=None, max_results=50, download_subtitles=True):
     print(f"📊 Max results: {max_results}")
 
     run = client.actor(ACTORS["youtube"]).call(run_input=run_input)
+    if raw:
+        return {"dataset_id": run["defaultDatasetId"]}
+
     dataset_items = list(client.dataset(run["defaultDatasetId"]).iterate_items())
 
-    return {"videos": dataset_items, "scraped_at": datetime.now().isoformat()}
+    return {"videos": dataset_items, "scraped_at": (now or datetime.now()).isoformat()}
 
-def scrape_website(urls, max_pages=100, output_format="markdown"):
-    """Scrape website content for RAG/LLM."""
-    client = ApifyClient(APIFY_TOKEN)
+def scrape_website(urls, max_pages=100, output_format="markdown", raw=False, now=None):
+    """Scrape website content for RAG/LLM; now is the scrape session time used for scraped_at."""
+    client = get_client()
 
     if isinstance(urls, str):
         urls = [urls]
@@ -113,45 +106,92 @@ def scrape_website(urls, max_pages=100, output_format="markdown"):
     print(f"📊 Max pages: {max_pages}")
 
     run = client.actor(ACTORS["website"]).call(run_input=run_input)
-    dataset_items = list(client.dataset(run["defaultDatasetId"]).iterate_items())
-
-    return {"pages": dataset_items, "scraped_at": datetime.now().isoformat()}
+    if raw:
+        return {"dataset_id": run["defaultDatasetId"]}
 
-def save_results(data, platform, filename=None):
-    """Save results to .tmp directory."""
-    OUTPUT_DIR.mkdir(exist_ok=True)
+    dataset_items = list(client.dataset(run["defaultDatasetId"]).iterate_items())
 
-    if not filename:
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        filename = f"{platform}_content_{timestamp}.json"
+    return {"pages": dataset_items, "scraped_at": (now or datetime.now()).isoformat()}
+
+async def scrape_all(hashtags=None, search_query=None, urls=None, max_results=50,
+                     max_pages=100, download_videos=False, download_subtitles=True,
+                     raw=False, now=None):
+    """
+    Scrape TikTok, YouTube and (when URLs are given) websites concurrently.
+
+    Each actor call blocks while Apify runs it, so the scrapers run in worker
+    threads and are awaited together. Every result is stamped with the same
+    session time, now.
+
+    Returns:
+        dict: Platform name -> scraper result, or the exception it raised
+    """
+    # Create the shared client up front so the worker threads all reuse it
+    get_client()
+
+    now = now or datetime.now()
+    jobs = {
+        "tiktok": asyncio.to_thread(
+            scrape_tiktok, hashtags, max_results, download_videos, raw=raw, now=now
+        ),
+        "youtube": asyncio.to_thread(
+            scrape_youtube, search_query, max_results, download_subtitles, raw=raw, now=now
+        ),
+    }
+    if urls:
+        jobs["website"] = asyncio.to_thread(scrape_website, urls, max_pages, raw=raw, now=now)
 
-    output_path = OUTPUT_DIR / filename
+    print(f"🚀 Running {len(jobs)} scrapers concurrently: {', '.join(jobs)}")
 
-    with open(output_path, 'w', encoding='utf-8') as f:
-        json.dump(data, f, indent=2, ensure_ascii=False)
+    results = await asyncio.gather(*jobs.values(), return_exceptions=True)
+    return dict(zip(jobs, results))
 
-    print(f"\n💾 Results saved to: {output_path}")
+def save_results(data, platform, filename=None, now=None):
+    """Save results to .tmp directory."""
+    output_path = save_json_results(
+        data, f"{platform}_content", filename, now=now,
+        stream_key="pages" if platform == "website" else "videos"
+    )
 
-    # Print summary stats
+    # Build summary stats and emit them in a single write
+    lines = []
     if platform == "tiktok":
-        print(f"📊 Total videos: {len(data.get('videos', []))}")
+        lines.append(f"📊 Total videos: {len(data.get('videos', []))}")
         for i, video in enumerate(data.get('videos', [])[:3], 1):
-            print(f"\n{i}. {video.get('text', 'No caption')[:50]}...")
-            print(f"   👤 @{video.get('authorMeta', {}).get('name', 'unknown')}")
-            print(f"   ❤️  {video.get('diggCount', 0)} | 💬 {video.get('commentCount', 0)}")
+            lines.append(f"\n{i}. {video.get('text', 'No caption')[:50]}...")
+            lines.append(f"   👤 @{video.get('authorMeta', {}).get('name', 'unknown')}")
+            lines.append(f"   ❤️  {video.get('diggCount', 0)} | 💬 {video.get('commentCount', 0)}")
 
     elif platform == "youtube":
-        print(f"📊 Total videos: {len(data.get('videos', []))}")
+        lines.append(f"📊 Total videos: {len(data.get('videos', []))}")
         for i, video in enumerate(data.get('videos', [])[:3], 1):
-            print(f"\n{i}. {video.get('title', 'No title')[:60]}...")
-            print(f"   📺 {video.get('channelName', 'unknown')}")
-            print(f"   👁️  {video.get('viewCount', 0)} views")
+            lines.append(f"\n{i}. {video.get('title', 'No title')[:60]}...")
+            lines.append(f"   📺 {video.get('channelName', 'unknown')}")
+            lines.append(f"   👁️  {video.get('viewCount', 0)} views")
 
     elif platform == "website":
-        print(f"📊 Total pages: {len(data.get('pages', []))}")
+        lines.append(f"📊 Total pages: {len(data.get('pages', []))}")
         for i, page in enumerate(data.get('pages', [])[:3], 1):
-            print(f"\n{i}. {page.get('title', 'No title')[:60]}...")
-            print(f"   🔗 {page.get('url', 'unknown')}")
+            lines.append(f"\n{i}. {page.get('title', 'No title')[:60]}...")
+            lines.append(f"   🔗 {page.get('url', 'unknown')}")
+
+    if lines:
+        sys.stdout.write("\n".join(lines) + "\n")
+
+    return output_path
+
+def save_raw_results(data, platform, filename=None, now=None):
+    """
+    Save an Actor's dataset to .tmp exactly as Apify returns it.
+
+    The items are streamed to disk as JSON bytes and never decoded, so no
+    summary is printed.
+    """
+    output_path = build_output_path(f"{platform}_raw", filename, now=now)
+
+    write_dataset_raw(get_client().dataset(data["dataset_id"]), output_path)
+
+    print(f"\n💾 Raw {platform} dataset saved to: {output_path}")
 
     return output_path
 
@@ -183,37 +223,92 @@ def main():
     website_parser.add_argument("--max-pages", type=int, default=100)
     website_parser.add_argument("--output", help="Custom output filename")
 
+    # All platforms subcommand
+    all_parser = subparsers.add_parser("all", help="Scrape all platforms concurrently")
+    all_parser.add_argument("--hashtags", nargs="+", help="TikTok hashtags to scrape")
+    all_parser.add_argument("--search", help="YouTube search query")
+    all_parser.add_argument("--urls", nargs="+", help="URLs to crawl (website skipped if omitted)")
+    all_parser.add_argument("--max-results", type=int, default=50)
+    all_parser.add_argument("--max-pages", type=int, default=100)
+    all_parser.add_argument("--download-videos", action="store_true")
+    all_parser.add_argument("--no-subtitles", action="store_true")
+
+    for platform_parser in (tiktok_parser, youtube_parser, website_parser, all_parser):
+        platform_parser.add_argument(
+            "--raw",
+            action="store_true",
+            help="Save the Apify dataset as-is, without decoding or summarizing it"
+        )
+
     args = parser.parse_args()
 
+    # One timestamp for the whole scrape session, shared by every output file
+    now = datetime.now()
+
     if not args.platform:
         parser.print_help()
         return 1
 
+    save = save_raw_results if args.raw else save_results
+
     try:
         # Validate environment
-        validate_environment()
+        validate_env()
+
+        if args.platform == "all":
+            all_results = asyncio.run(scrape_all(
+                hashtags=args.hashtags,
+                search_query=args.search,
+                urls=args.urls,
+                max_results=args.max_results,
+                max_pages=args.max_pages,
+                download_videos=args.download_videos,
+                download_subtitles=not args.no_subtitles,
+                raw=args.raw,
+                now=now
+            ))
+
+            failed = []
+            for platform, results in all_results.items():
+                if isinstance(results, Exception):
+                    print(f"❌ {platform} scraping failed: {results}")
+                    failed.append(platform)
+                else:
+                    save(results, platform, now=now)
+
+            if failed:
+                return 1
+
+            print("\n✅ Scraping completed successfully!")
+            return 0
 
         # Run appropriate scraper
         if args.platform == "tiktok":
             results = scrape_tiktok(
                 hashtags=args.hashtags,
                 max_results=args.max_results,
-                download_videos=args.download_videos
+                download_videos=args.download_videos,
+                raw=args.raw,
+                now=now
             )
         elif args.platform == "youtube":
             results = scrape_youtube(
                 search_query=args.search,
                 max_results=args.max_results,
-                download_subtitles=not args.no_subtitles
+                download_subtitles=not args.no_subtitles,
+                raw=args.raw,
+                now=now
             )
         elif args.platform == "website":
             results = scrape_website(
                 urls=args.urls,
-                max_pages=args.max_pages
+                max_pages=args.max_pages,
+                raw=args.raw,
+                now=now
             )
 
         # Save results
-        save_results(results, args.platform, getattr(args, 'output', None))
+        save(results, args.platform, getattr(args, 'output', None), now=now)
 
         print("\n✅ Scraping completed successfully!")
         return 0
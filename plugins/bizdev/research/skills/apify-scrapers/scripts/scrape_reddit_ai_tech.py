@@ -7,21 +7,20 @@ Usage:
     python execution/scrape_reddit_ai_tech.py [--max-posts 50] [--sort hot]
 """
 
-import os
-import json
+import sys
 from datetime import datetime
-from pathlib import Path
-from apify_client import ApifyClient
 from dotenv import load_dotenv
 import argparse
+from operator import itemgetter
+
+from _common import build_output_path, get_client, save_json_results, validate_env
+from _json_io import write_dataset_raw
 
 # Load environment variables
 load_dotenv()
 
 # Configuration
-APIFY_TOKEN = os.getenv("APIFY_TOKEN")
 ACTOR_ID = "trudax/reddit-scraper-lite"  # Free tier actor
-OUTPUT_DIR = Path(__file__).parent.parent / ".tmp"
 
 # AI/Tech-focused subreddits
 DEFAULT_SUBREDDITS = [
@@ -36,13 +35,24 @@ DEFAULT_SUBREDDITS = [
     "r/Futurology"
 ]
 
-def validate_environment():
-    """Validate required environment variables."""
-    if not APIFY_TOKEN:
-        raise ValueError(
-            "APIFY_TOKEN not found in environment. "
-            "Please add it to your .env file."
-        )
+# Field aliases across Reddit actor versions, in priority order
+SCORE_KEYS = ("score", "ups", "upvotes", "upCount")
+ID_KEYS = ("id", "parsedId")
+SUBREDDIT_KEYS = ("subreddit", "communityName", "parsedCommunityName")
+AUTHOR_KEYS = ("author", "username")
+UPVOTE_RATIO_KEYS = ("upvote_ratio", "upvoteRatio")
+NUM_COMMENTS_KEYS = ("num_comments", "numberOfComments")
+PERMALINK_KEYS = ("permalink", "url")
+CREATED_KEYS = ("created_utc", "createdAt")
+SELFTEXT_KEYS = ("selftext", "body")
+
+def first_value(item, keys, default=""):
+    """Return the first truthy value of keys in item, or default."""
+    for key in keys:
+        value = item.get(key)
+        if value:
+            return value
+    return default
 
 def run_reddit_scraper(
     subreddits=None,
@@ -73,7 +83,7 @@ def run_reddit_scraper(
     print(f"📊 Max posts: {max_posts}, Sort: {sort_by}, Time: {time_filter}")
 
     # Initialize Apify client
-    client = ApifyClient(APIFY_TOKEN)
+    client = get_client()
 
     # Prepare Actor input - use search in communities for better results
     communities = [sub.replace("r/", "") for sub in subreddits]
@@ -106,16 +116,14 @@ def run_reddit_scraper(
         print(f"📋 Run ID: {run['id']}")
         print(f"⏱️  Duration: {run.get('duration', 'N/A')}s")
 
-        # Fetch results from dataset
-        print("📥 Fetching results...")
-        dataset_items = list(client.dataset(run["defaultDatasetId"]).iterate_items())
+        # Lazy dataset iterator; items are fetched as process_results consumes them
+        dataset_items = client.dataset(run["defaultDatasetId"]).iterate_items()
 
         return {
             "success": True,
             "run_id": run['id'],
             "dataset_id": run["defaultDatasetId"],
-            "items": dataset_items,
-            "count": len(dataset_items)
+            "items": dataset_items
         }
 
     except Exception as e:
@@ -123,17 +131,60 @@ def run_reddit_scraper(
         return {
             "success": False,
             "error": str(e),
-            "items": [],
-            "count": 0
+            "items": []
         }
 
-def process_results(results, min_score=10):
+def _normalize_reddit_post(item, score, title):
+    """
+    Map a raw Apify Reddit item onto the output post schema.
+
+    Args:
+        item (dict): Raw dataset item
+        score (int): Resolved upvote score
+        title (str): Post title
+
+    Returns:
+        dict: Normalized post with its top comments
+    """
+    # Extract post data (mapping lite version fields)
+    post = {
+        "id": first_value(item, ID_KEYS),
+        "title": title,
+        "subreddit": first_value(item, SUBREDDIT_KEYS),
+        "author": first_value(item, AUTHOR_KEYS),
+        "score": score,
+        "upvote_ratio": first_value(item, UPVOTE_RATIO_KEYS, 0),
+        "num_comments": first_value(item, NUM_COMMENTS_KEYS, 0),
+        "url": item.get("url", ""),
+        "permalink": first_value(item, PERMALINK_KEYS),
+        "created_utc": first_value(item, CREATED_KEYS),
+        "selftext": first_value(item, SELFTEXT_KEYS)[:500],  # Limit text length
+        "link_flair_text": item.get("link_flair_text", ""),
+        "is_video": item.get("is_video", False),
+        "top_comments": []
+    }
+
+    # Extract top comments
+    comments = item.get("comments", [])
+    for comment in comments[:5]:  # Top 5 comments
+        if isinstance(comment, dict):
+            post["top_comments"].append({
+                "author": comment.get("author", ""),
+                "body": comment.get("body", "")[:300],  # Limit length
+                "score": comment.get("score", 0)
+            })
+
+    return post
+
+def process_results(results, min_score=10, verbose=False, now=None):
     """
     Process and structure the scraped results.
 
     Args:
-        results (dict): Raw results from Apify
+        results (dict): Raw results from Apify; "items" may be a lazy iterator
         min_score (int): Minimum upvote score filter
+        verbose (bool): Whether to print the first item's keys
+        now (datetime, optional): Scrape session time (defaults to the current time)
 
     Returns:
         dict: Cleaned and structured data
@@ -142,18 +193,20 @@ def process_results(results, min_score=10):
 
     print(f"🔍 Filtering for posts with {min_score}+ upvotes")
 
-    total_scraped = len(results["items"])
+    total_scraped = 0
     filtered_count = 0
 
-    # Debug: Print first item structure
-    if results["items"]:
-        print(f"📋 Sample item keys: {list(results['items'][0].keys())[:10]}")
-
+    print("📥 Fetching results...")
     for item in results["items"]:
+        total_scraped += 1
+
+        # Debug: Print first item structure
+        if verbose and total_scraped == 1:
+            print(f"📋 Sample item keys: {list(item.keys())[:10]}")
+
         # The lite version returns different field names
         # Handle different possible score field names
-        score = (item.get("score", 0) or item.get("ups", 0) or
-                item.get("upvotes", 0) or item.get("upCount", 0) or 0)
+        score = first_value(item, SCORE_KEYS, 0)
 
         # If no score field, skip filtering (accept all)
         if score > 0 and score < min_score:
@@ -164,81 +217,64 @@ def process_results(results, min_score=10):
         if not title or len(title) < 5:
             continue
 
-        # Extract post data (mapping lite version fields)
-        post = {
-            "id": item.get("id", "") or item.get("parsedId", ""),
-            "title": title,
-            "subreddit": item.get("subreddit", "") or item.get("communityName", "") or item.get("parsedCommunityName", ""),
-            "author": item.get("author", "") or item.get("username", ""),
-            "score": score,
-            "upvote_ratio": item.get("upvote_ratio", 0) or item.get("upvoteRatio", 0),
-            "num_comments": item.get("num_comments", 0) or item.get("numberOfComments", 0),
-            "url": item.get("url", ""),
-            "permalink": item.get("permalink", "") or item.get("url", ""),
-            "created_utc": item.get("created_utc", "") or item.get("createdAt", ""),
-            "selftext": (item.get("selftext", "") or item.get("body", ""))[:500],  # Limit text length
-            "link_flair_text": item.get("link_flair_text", ""),
-            "is_video": item.get("is_video", False),
-            "top_comments": []
-        }
-
-        # Extract top comments
-        comments = item.get("comments", [])
-        for comment in comments[:5]:  # Top 5 comments
-            if isinstance(comment, dict):
-                post["top_comments"].append({
-                    "author": comment.get("author", ""),
-                    "body": comment.get("body", "")[:300],  # Limit length
-                    "score": comment.get("score", 0)
-                })
-
+        post = _normalize_reddit_post(item, score, title)
         processed_posts.append(post)
         filtered_count += 1
 
     # Sort by score descending
-    processed_posts.sort(key=lambda x: x["score"], reverse=True)
+    processed_posts.sort(key=itemgetter("score"), reverse=True)
 
     print(f"✨ Filtered {filtered_count} posts from {total_scraped} total")
 
     return {
         "posts": processed_posts,
-        "scraped_at": datetime.now().isoformat(),
+        "scraped_at": (now or datetime.now()).isoformat(),
         "total_count": len(processed_posts),
         "total_scraped": total_scraped,
         "run_id": results.get("run_id", ""),
     }
 
-def save_results(data, filename=None):
+def save_results(data, filename=None, now=None):
     """
     Save results to .tmp directory.
 
     Args:
         data (dict): Processed post data
         filename (str, optional): Custom filename
+        now (datetime, optional): Scrape session time used in the default filename
     """
-    # Ensure output directory exists
-    OUTPUT_DIR.mkdir(exist_ok=True)
+    output_path = save_json_results(
+        data, "reddit_ai_tech", filename, now=now, stream_key="posts"
+    )
 
-    # Generate filename
-    if not filename:
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        filename = f"reddit_ai_tech_{timestamp}.json"
+    print(f"📊 Total posts: {data['total_count']}")
 
-    output_path = OUTPUT_DIR / filename
+    # Build top 5 posts and emit them in a single write
+    lines = ["\n🔥 Top 5 Posts by Score:"]
+    for i, post in enumerate(data['posts'][:5], 1):
+        lines.append(f"\n{i}. r/{post['subreddit']} - {post['title'][:60]}...")
+        lines.append(f"   ⬆️  {post['score']} | 💬 {post['num_comments']} comments")
+        lines.append(f"   🔗 {post['permalink']}")
 
-    # Save to file
-    with open(output_path, 'w', encoding='utf-8') as f:
-        json.dump(data, f, indent=2, ensure_ascii=False)
+    sys.stdout.write("\n".join(lines) + "\n")
 
-    print(f"💾 Results saved to: {output_path}")
-    print(f"📊 Total posts: {data['total_count']}")
+    return output_path
 
-    # Print top 5 posts
-    print("\n🔥 Top 5 Posts by Score:")
-    for i, post in enumerate(data['posts'][:5], 1):
-        print(f"\n{i}. r/{post['subreddit']} - {post['title'][:60]}...")
-        print(f"   ⬆️  {post['score']} | 💬 {post['num_comments']} comments")
-        print(f"   🔗 {post['permalink']}")
+def save_raw_results(dataset_id, filename=None, now=None):
+    """
+    Save the Actor's dataset to .tmp exactly as Apify returns it.
+
+    Args:
+        dataset_id (str): Apify dataset ID from the run
+        filename (str, optional): Custom filename
+        now (datetime, optional): Scrape session time used in the default filename
+    """
+    output_path = build_output_path("reddit_ai_tech_raw", filename, now=now)
+
+    # Stream the dataset's JSON bytes straight to disk; nothing is decoded
+    write_dataset_raw(get_client().dataset(dataset_id), output_path)
+
+    print(f"💾 Raw dataset saved to: {output_path}")
 
     return output_path
 
@@ -290,12 +326,25 @@ def main():
         "--output",
         help="Custom output filename"
     )
+    parser.add_argument(
+        "--verbose",
+        action="store_true",
+        help="Print debug details about the scraped items"
+    )
+    parser.add_argument(
+        "--raw",
+        action="store_true",
+        help="Save the Apify dataset as-is, skipping filtering and sorting"
+    )
 
     args = parser.parse_args()
 
+    # One timestamp for the whole scrape session
+    now = datetime.now()
+
     try:
         # Validate environment
-        validate_environment()
+        validate_env()
 
         # Run scraper
         results = run_reddit_scraper(
@@ -311,11 +360,18 @@ def main():
             print(f"❌ Scraping failed: {results.get('error')}")
             return 1
 
+        if args.raw:
+            save_raw_results(results["dataset_id"], args.output, now=now)
+            print("\n✅ Scraping completed successfully!")
+            return 0
+
         # Process results
-        processed_data = process_results(results, min_score=args.min_score)
+        processed_data = process_results(
+            results, min_score=args.min_score, verbose=args.verbose, now=now
+        )
 
         # Save results
-        save_results(processed_data, args.output)
+        save_results(processed_data, args.output, now=now)
 
         print("\n✅ Scraping completed successfully!")
         return 0
@@ -7,30 +7,20 @@ Usage:
     python execution/scrape_twitter_ai_trends.py [--max-tweets 100] [--query "AI"]
 """
 
-import os
-import json
+import sys
 import time
 from datetime import datetime
-from pathlib import Path
-from apify_client import ApifyClient
 from dotenv import load_dotenv
 import argparse
+from operator import itemgetter
+
+from _common import get_client, save_json_results, validate_env
 
 # Load environment variables
 load_dotenv()
 
 # Configuration
-APIFY_TOKEN = os.getenv("APIFY_TOKEN")
 ACTOR_ID = "kaitoeasyapi/twitter-x-data-tweet-scraper-pay-per-result-cheapest"
-OUTPUT_DIR = Path(__file__).parent.parent / ".tmp"
-
-def validate_environment():
-    """Validate required environment variables."""
-    if not APIFY_TOKEN:
-        raise ValueError(
-            "APIFY_TOKEN not found in environment. "
-            "Please add it to your .env file."
-        )
 
 def run_twitter_scraper(query="AI", max_tweets=50):
     """
@@ -47,7 +37,7 @@ def run_twitter_scraper(query="AI", max_tweets=50):
     print(f"📊 Max tweets: {max_tweets}")
 
     # Initialize Apify client
-    client = ApifyClient(APIFY_TOKEN)
+    client = get_client()
 
     # Prepare Actor input using correct API parameters
     run_input = {
@@ -70,16 +60,14 @@ def run_twitter_scraper(query="AI", max_tweets=50):
         print(f"📋 Run ID: {run['id']}")
         print(f"⏱️  Duration: {run.get('duration', 'N/A')}s")
 
-        # Fetch results from dataset
-        print("📥 Fetching results...")
-        dataset_items = list(client.dataset(run["defaultDatasetId"]).iterate_items())
+        # Lazy dataset iterator; items are fetched as process_results consumes them
+        dataset_items = client.dataset(run["defaultDatasetId"]).iterate_items()
 
         return {
             "success": True,
             "run_id": run['id'],
             "dataset_id": run["defaultDatasetId"],
-            "items": dataset_items,
-            "count": len(dataset_items)
+            "items": dataset_items
         }
 
     except Exception as e:
@@ -87,35 +75,66 @@ def run_twitter_scraper(query="AI", max_tweets=50):
         return {
             "success": False,
             "error": str(e),
-            "items": [],
-            "count": 0
+            "items": []
         }
 
-def process_results(results, min_likes=10, min_retweets=5):
+def _normalize_tweet(item, likes, retweets):
+    """
+    Map a raw Apify tweet item onto the output tweet schema.
+
+    Args:
+        item (dict): Raw dataset item
+        likes (int): Like count
+        retweets (int): Retweet count
+
+    Returns:
+        dict: Normalized tweet
+    """
+    # Look up the nested author once; the Actor may send null
+    author = item.get("author") or {}
+
+    # createdAt is kept as-is (not filtered strictly - data quality issues)
+    return {
+        "id": item.get("id", ""),
+        "text": item.get("text", ""),
+        "author": author.get("userName", ""),
+        "author_name": author.get("name", ""),
+        "created_at": item.get("createdAt", ""),
+        "likes": likes,
+        "retweets": retweets,
+        "replies": item.get("replyCount", 0),
+        "views": item.get("viewCount", 0),
+        "url": item.get("url", ""),
+        "engagement_score": likes + retweets,
+    }
+
+def process_results(results, min_likes=10, min_retweets=5, now=None):
     """
     Process and structure the scraped results, filtering for trending tweets.
 
     Args:
-        results (dict): Raw results from Apify
+        results (dict): Raw results from Apify; "items" may be a lazy iterator
         min_likes (int): Minimum likes for trending filter
         min_retweets (int): Minimum retweets for trending filter
+        now (datetime, optional): Scrape session time (defaults to the current time)
 
     Returns:
         dict: Cleaned and structured data with only trending tweets
     """
-    from dateutil import parser
-
     processed_tweets = []
-    now = datetime.now()
+    now = now or datetime.now()
     cutoff_time = now.replace(hour=0, minute=0, second=0, microsecond=0)  # Today at midnight
 
     print(f"🔍 Filtering for tweets since: {cutoff_time.isoformat()}")
     print(f"📊 Engagement threshold: {min_likes}+ likes OR {min_retweets}+ retweets")
 
-    total_scraped = len(results["items"])
+    total_scraped = 0
     filtered_count = 0
 
+    print("📥 Fetching results...")
     for item in results["items"]:
+        total_scraped += 1
+
         # Skip retweets - we want original content only
         if item.get("isRetweet", False):
             continue
@@ -127,36 +146,17 @@ def process_results(results, min_likes=10, min_retweets=5):
         if likes < min_likes and retweets < min_retweets:
             continue
 
-        # Parse and check date (but don't filter strictly - data quality issues)
-        created_at_str = item.get("createdAt", "")
-
-        tweet = {
-            "id": item.get("id", ""),
-            "text": item.get("text", ""),
-            "author": item.get("author", {}).get("userName", ""),
-            "author_name": item.get("author", {}).get("name", ""),
-            "created_at": created_at_str,
-            "likes": likes,
-            "retweets": retweets,
-            "replies": item.get("replyCount", 0),
-            "views": item.get("viewCount", 0),
-            "url": item.get("url", ""),
-            "engagement_score": likes + retweets,
-        }
-        processed_tweets.append(tweet)
+        processed_tweets.append(_normalize_tweet(item, likes, retweets))
         filtered_count += 1
 
     # Sort by engagement score (likes + retweets) descending
-    processed_tweets.sort(
-        key=lambda x: x["engagement_score"],
-        reverse=True
-    )
+    processed_tweets.sort(key=itemgetter("engagement_score"), reverse=True)
 
     print(f"✨ Filtered {filtered_count} trending tweets from {total_scraped} total")
 
     return {
         "tweets": processed_tweets,
-        "scraped_at": datetime.now().isoformat(),
+        "scraped_at": now.isoformat(),
         "total_count": len(processed_tweets),
         "total_scraped": total_scraped,
         "query_used": results.get("query", "AI"),
@@ -169,38 +169,31 @@ def process_results(results, min_likes=10, min_retweets=5):
         }
     }
 
-def save_results(data, filename=None):
+def save_results(data, filename=None, now=None):
     """
     Save results to .tmp directory.
 
     Args:
         data (dict): Processed tweet data
         filename (str, optional): Custom filename
+        now (datetime, optional): Scrape session time used in the default filename
     """
-    # Ensure output directory exists
-    OUTPUT_DIR.mkdir(exist_ok=True)
-
-    # Generate filename
-    if not filename:
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        filename = f"twitter_ai_trends_{timestamp}.json"
-
-    output_path = OUTPUT_DIR / filename
-
-    # Save to file
-    with open(output_path, 'w', encoding='utf-8') as f:
-        json.dump(data, f, indent=2, ensure_ascii=False)
+    # Encoded with orjson when available; tweets are streamed one at a time
+    output_path = save_json_results(
+        data, "twitter_ai_trends", filename, now=now, stream_key="tweets"
+    )
 
-    print(f"💾 Results saved to: {output_path}")
     print(f"📊 Total tweets: {data['total_count']}")
 
-    # Print top 5 tweets
-    print("\n🔥 Top 5 Most Engaged Tweets:")
+    # Build top 5 tweets and emit them in a single write
+    lines = ["\n🔥 Top 5 Most Engaged Tweets:"]
     for i, tweet in enumerate(data['tweets'][:5], 1):
-        print(f"\n{i}. @{tweet['author']}")
-        print(f"   {tweet['text'][:100]}...")
-        print(f"   ❤️  {tweet['likes']} | 🔄 {tweet['retweets']} | 👁️  {tweet['views']}")
-        print(f"   🔗 {tweet['url']}")
+        lines.append(f"\n{i}. @{tweet['author']}")
+        lines.append(f"   {tweet['text'][:100]}...")
+        lines.append(f"   ❤️  {tweet['likes']} | 🔄 {tweet['retweets']} | 👁️  {tweet['views']}")
+        lines.append(f"   🔗 {tweet['url']}")
+
+    sys.stdout.write("\n".join(lines) + "\n")
 
     return output_path
 
@@ -239,9 +232,12 @@ def main():
 
     args = parser.parse_args()
 
+    # One timestamp for the whole scrape session
+    now = datetime.now()
+
     try:
         # Validate environment
-        validate_environment()
+        validate_env()
 
         # Run scraper
         results = run_twitter_scraper(
@@ -258,11 +254,12 @@ def main():
         processed_data = process_results(
             results,
             min_likes=args.min_likes,
-            min_retweets=args.min_retweets
+            min_retweets=args.min_retweets,
+            now=now
         )
 
         # Save results
-        save_results(processed_data, args.output)
+        save_results(processed_data, args.output, now=now)
 
         print("\n✅ Scraping completed successfully!")
         return 0